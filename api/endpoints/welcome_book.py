@@ -33,6 +33,23 @@ async def get_visitors(
         logger.error(f"Error retrieving visitors: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve visitors")
 
+@router.get("/{visitor_id}", response_model=Visitor)
+async def get_visitor(
+    visitor_id: str,
+    visitor_service: VisitorService = Depends(get_visitor_service)
+):
+    """
+    Get a specific visitor from the welcome book by id.
+    """
+    try:
+        visitor = visitor_service.get_visitor(visitor_id)
+    except Exception as e:
+        logger.error(f"Error retrieving visitor {visitor_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve visitor")
+    if not visitor:
+        raise HTTPException(status_code=404, detail=f"Visitor with id '{visitor_id}' not found")
+    return visitor
+
 @router.post("/", response_model=Visitor)
 async def sign_welcome_book(
     visitor: VisitorCreate,
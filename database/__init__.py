@@ -21,6 +21,7 @@ from database.visitor_db import (
 )
 from database.feedback_db import (
     add_feedback, 
+    add_feedback_bulk, 
     get_feedback, 
     get_feedback_by_id, 
     get_feedback_by_agent_name
@@ -46,7 +47,7 @@ __all__ = [
     'add_visitor', 'get_visitors', 'get_visitor_by_id', 'get_visitor_by_name_and_agent_type',
     
     # Feedback operations
-    'add_feedback', 'get_feedback', 'get_feedback_by_id', 'get_feedback_by_agent_name',
+    'add_feedback', 'add_feedback_bulk', 'get_feedback', 'get_feedback_by_id', 'get_feedback_by_agent_name',
     
     # Migration
     'migrate_all_data', 'import_welcome_book_data', 'import_feedback_data',
@@ -5,7 +5,7 @@ Data access layer for feedback table.
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 
 import sqlite3
 from database.connection import db
@@ -87,25 +87,13 @@ def get_feedback_by_agent_name(agent_name: str, limit: int = 10) -> List[Dict[st
         logger.error(f"Error retrieving feedback for agent {agent_name}: {e}")
         raise
 
-def add_feedback(agent_name: str, agent_type: Optional[str] = None, 
-                issues: Optional[str] = None, feature_requests: Optional[str] = None,
-                usability_rating: Optional[int] = None, 
-                additional_comments: Optional[str] = None) -> Dict[str, Any]:
+def _validate_feedback_fields(agent_name: str, agent_type: Optional[str],
+                              issues: Optional[str], feature_requests: Optional[str],
+                              usability_rating: Optional[int],
+                              additional_comments: Optional[str]) -> None:
     """
-    Add a new feedback entry to the database.
-    
-    Args:
-        agent_name: Agent's name
-        agent_type: Agent's type
-        issues: Reported issues
-        feature_requests: Requested features
-        usability_rating: Rating from 1-10
-        additional_comments: Additional comments
-        
-    Returns:
-        The created feedback dictionary
+    Validate feedback fields, raising ValueError on the first invalid one.
     """
-    # Validate input
     if not agent_name or len(agent_name) > 100:
         raise ValueError("Agent name is required and must be 100 characters or less")
     
@@ -123,6 +111,28 @@ def add_feedback(agent_name: str, agent_type: Optional[str] = None,
         
     if usability_rating is not None and not (1 <= usability_rating <= 10):
         raise ValueError("Usability rating must be between 1 and 10")
+
+def add_feedback(agent_name: str, agent_type: Optional[str] = None, 
+                issues: Optional[str] = None, feature_requests: Optional[str] = None,
+                usability_rating: Optional[int] = None, 
+                additional_comments: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add a new feedback entry to the database.
+    
+    Args:
+        agent_name: Agent's name
+        agent_type: Agent's type
+        issues: Reported issues
+        feature_requests: Requested features
+        usability_rating: Rating from 1-10
+        additional_comments: Additional comments
+        
+    Returns:
+        The created feedback dictionary
+    """
+    # Validate input
+    _validate_feedback_fields(agent_name, agent_type, issues, feature_requests,
+                              usability_rating, additional_comments)
     
     feedback_id = str(uuid.uuid4())
     submission_time = datetime.now()
@@ -155,4 +165,56 @@ def add_feedback(agent_name: str, agent_type: Optional[str] = None,
         }
     except sqlite3.Error as e:
         logger.error(f"Error adding feedback: {e}")
-        raise 
\ No newline at end of file
+        raise
+
+def add_feedback_bulk(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Add several feedback entries to the database in a single transaction.
+    
+    Args:
+        entries: Feedback dictionaries with the same keys as add_feedback's arguments
+        
+    Returns:
+        The created feedback dictionaries
+    """
+    records = []
+    for entry in entries:
+        # Validate every entry before touching the database
+        _validate_feedback_fields(
+            entry["agent_name"], entry.get("agent_type"), entry.get("issues"),
+            entry.get("feature_requests"), entry.get("usability_rating"),
+            entry.get("additional_comments")
+        )
+        records.append({
+            "id": str(uuid.uuid4()),
+            "agent_name": entry["agent_name"],
+            "agent_type": entry.get("agent_type"),
+            "submission_time": datetime.now(),
+            "issues": entry.get("issues"),
+            "feature_requests": entry.get("feature_requests"),
+            "usability_rating": entry.get("usability_rating"),
+            "additional_comments": entry.get("additional_comments")
+        })
+    
+    if not records:
+        return []
+    
+    insert_query = """
+    INSERT INTO feedback (
+        id, agent_name, agent_type, submission_time, issues, 
+        feature_requests, usability_rating, additional_comments
+    ) VALUES (
+        :id, :agent_name, :agent_type, :submission_time, :issues,
+        :feature_requests, :usability_rating, :additional_comments
+    )
+    """
+    
+    try:
+        # One executemany inside one transaction instead of a commit per row
+        with db.get_connection(for_write=True) as conn:
+            conn.executemany(insert_query, records)
+            conn.commit()
+        return records
+    except sqlite3.Error as e:
+        logger.error(f"Error adding feedback in bulk: {e}")
+        raise
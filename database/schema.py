@@ -63,6 +63,18 @@ CREATE TABLE IF NOT EXISTS feedback (
 );
 """
 
+# SQL to create the trigger rejecting out of range feedback ratings
+CREATE_FEEDBACK_RATING_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS enforce_valid_rating
+BEFORE INSERT ON feedback
+BEGIN
+    SELECT CASE
+        WHEN NEW.usability_rating < 0 OR NEW.usability_rating > 10
+        THEN RAISE(ABORT, 'Rating must be between 0 and 10')
+    END;
+END;
+"""
+
 # SQL to create the schema_version table
 CREATE_SCHEMA_VERSION_TABLE = """
 CREATE TABLE IF NOT EXISTS schema_version (
@@ -80,6 +92,7 @@ def create_tables() -> None:
             conn.executescript(CREATE_VISITORS_TABLE)
             conn.executescript(CREATE_ANSWERS_TABLE)
             conn.executescript(CREATE_FEEDBACK_TABLE)
+            conn.executescript(CREATE_FEEDBACK_RATING_TRIGGER)
             conn.executescript(CREATE_SCHEMA_VERSION_TABLE)
             
             # Set initial schema version if not exists
@@ -8,10 +8,10 @@ import tempfile
 import sqlite3
 from datetime import datetime
 
-from database.connection import DatabaseConnection
+from database.connection import DatabaseConnection, db
 from database.schema import create_tables
 from database.visitor_db import add_visitor, get_visitor_by_id, get_visitors
-from database.feedback_db import add_feedback, get_feedback
+from database.feedback_db import add_feedback, add_feedback_bulk, get_feedback, get_feedback_by_id
 
 class TestDatabase(unittest.TestCase):
     """Test the database functionality."""
@@ -95,6 +95,30 @@ class TestDatabase(unittest.TestCase):
         feedback_entries = get_feedback()
         self.assertEqual(len(feedback_entries), 1)
         
+    def test_feedback_bulk_operations(self):
+        """Test adding several feedback entries in one batch."""
+        entries = [
+            {"agent_name": "Bulk Agent 1", "usability_rating": 7},
+            {"agent_name": "Bulk Agent 2", "issues": "Bulk issues"}
+        ]
+        
+        feedback_data = add_feedback_bulk(entries)
+        try:
+            self.assertEqual(len(feedback_data), 2)
+            
+            # Check that each entry was stored
+            for created, entry in zip(feedback_data, entries):
+                stored = get_feedback_by_id(created["id"])
+                self.assertIsNotNone(stored)
+                self.assertEqual(stored["agent_name"], entry["agent_name"])
+        finally:
+            for created in feedback_data:
+                db.execute_update("DELETE FROM feedback WHERE id = ?", (created["id"],))
+        
+        # An invalid entry rejects the whole batch
+        with self.assertRaises(ValueError):
+            add_feedback_bulk([{"agent_name": "Bulk Agent 3"}, {"agent_name": "Test", "usability_rating": 11}])
+        
     def test_input_validation(self):
         """Test input validation."""
         # Test invalid name (too long)
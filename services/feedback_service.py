@@ -1,12 +1,17 @@
 import json
 import os
-import uuid
-import html
 import fcntl
+import heapq
+import mmap
+from itertools import pairwise
+from secrets import token_hex
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+import ijson
+
+from services.locking import ESCAPE_TABLE, atomic_write_json, flock, get_file_lock, load_json
 from models.visitor import Feedback, FeedbackCreate
 
 class FeedbackService:
@@ -14,6 +19,8 @@ class FeedbackService:
         self.data_file = data_file
         self.data_path = Path(data_file)
         self._ensure_data_file_exists()
+        # Serializes access to the data file across requests handled by this process
+        self._lock = get_file_lock(self.data_path)
         
         # Maximum allowed length for text fields
         self.max_name_length = 100
@@ -36,7 +43,7 @@ class FeedbackService:
             return ""
             
         # Strip any potentially dangerous HTML/script tags
-        sanitized = html.escape(text)
+        sanitized = text.translate(ESCAPE_TABLE)
         
         # Restrict to reasonable length
         return sanitized[:self.max_field_length]
@@ -72,60 +79,65 @@ class FeedbackService:
     
     def _load_data(self) -> List[Dict[str, Any]]:
         """Load feedback data from file with file locking."""
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            # Acquire shared lock for reading
-            fcntl.flock(f, fcntl.LOCK_SH)
+        # Acquire shared lock for reading
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_SH):
+            # Parse straight from a read-only memory map to skip copying the file into a str
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return load_json(view)
+    
+    def _iter_data(self) -> Iterator[Dict[str, Any]]:
+        """Stream feedback records from file one at a time with file locking."""
+        # Acquire shared lock for reading
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_SH):
+            streamed = 0
             try:
-                return json.load(f)
-            finally:
-                # Release the lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+                for item in ijson.items(f, 'item', use_float=True):
+                    yield item
+                    streamed += 1
+            except ijson.JSONError:
+                # ijson rejects NaN, Infinity and integers wider than 64 bits, which files written with
+                # json.dump may hold, so parse the whole file instead and carry on after the records already streamed
+                f.seek(0)
+                yield from load_json(f.read())[streamed:]
     
     def _save_data(self, data: List[Dict[str, Any]]):
         """Save feedback data to file with exclusive locking."""
         # Keep only the most recent entries if we exceed the limit
         if len(data) > self.max_feedback_entries:
-            # Sort by submission time (convert to datetime for sorting)
-            data.sort(key=lambda x: datetime.fromisoformat(x['submission_time']), reverse=True)
-            # Keep only the most recent ones
-            data = data[:self.max_feedback_entries]
+            # Records are only ever appended with the current time, so in a file kept in append order
+            # the last ones are the most recent. Files trimmed by older versions were stored newest first,
+            # so put a file that is out of order back in time order once; ISO timestamps sort as strings
+            if any(a['submission_time'] > b['submission_time'] for a, b in pairwise(data)):
+                data.sort(key=lambda item: item['submission_time'])
+            data = data[-self.max_feedback_entries:]
             
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            # Acquire exclusive lock for writing
-            fcntl.flock(f, fcntl.LOCK_EX)
-            try:
-                json.dump(data, f, default=str, indent=2)
-            finally:
-                # Release the lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+        # Acquire exclusive lock for writing
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_EX):
+            atomic_write_json(self.data_path, data)
     
     def get_feedback(self, limit: int = 10) -> List[Feedback]:
         """Get recent feedback entries."""
         # Ensure limit is reasonable
         limit = min(max(1, limit), 100)  # Between 1 and 100
         
-        data = self._load_data()
-        
-        # Convert to Feedback models and sort by submission time (most recent first)
-        feedback_entries = [
-            Feedback(
-                id=item['id'],
-                agent_name=item['agent_name'],
-                agent_type=item.get('agent_type'),
-                submission_time=datetime.fromisoformat(item['submission_time']),
-                issues=item.get('issues'),
-                feature_requests=item.get('feature_requests'),
-                usability_rating=item.get('usability_rating'),
-                additional_comments=item.get('additional_comments')
-            )
-            for item in data
-        ]
+        # Stream records and keep only the most recent ones; ISO timestamps sort chronologically as strings
+        recent = heapq.nlargest(limit, self._iter_data(), key=lambda item: item['submission_time'])
         
-        feedback_entries.sort(key=lambda x: x.submission_time, reverse=True)
-        return feedback_entries[:limit]
+        # Records are stored with every model field and were validated on insert,
+        # so pass them straight through without re-running validation
+        feedback_entries = []
+        for item in recent:
+            item['submission_time'] = datetime.fromisoformat(item['submission_time'])
+            # model_construct only fills fields that have a default, so a record missing a required
+            # field fails here as full validation would rather than producing a partial model
+            missing = {'id', 'agent_name'} - item.keys()
+            if missing:
+                raise KeyError(f"Feedback record is missing {', '.join(sorted(missing))}")
+            feedback_entries.append(Feedback.model_construct(**item))
+        return feedback_entries
     
-    def add_feedback(self, feedback: FeedbackCreate) -> Feedback:
-        """Add a new feedback entry."""
+    def _build_record(self, feedback: FeedbackCreate) -> Dict[str, Any]:
+        """Validate and sanitize a feedback submission into a record ready to store."""
         # Validate input
         errors = self._validate_feedback(feedback)
         if errors:
@@ -133,39 +145,43 @@ class FeedbackService:
             raise ValueError(f"Invalid feedback data: {error_msg}")
         
         # Sanitize input fields
-        sanitized_agent_name = self._sanitize_input(feedback.agent_name)
-        sanitized_agent_type = self._sanitize_input(feedback.agent_type) if feedback.agent_type else None
-        sanitized_issues = self._sanitize_input(feedback.issues) if feedback.issues else None
-        sanitized_feature_requests = self._sanitize_input(feedback.feature_requests) if feedback.feature_requests else None
-        sanitized_additional_comments = self._sanitize_input(feedback.additional_comments) if feedback.additional_comments else None
-        
-        # Load existing data
-        data = self._load_data()
-        
-        feedback_id = str(uuid.uuid4())
-        submission_time = datetime.now().isoformat()
-        
-        new_feedback = {
-            "id": feedback_id,
-            "agent_name": sanitized_agent_name,
-            "agent_type": sanitized_agent_type,
-            "submission_time": submission_time,
-            "issues": sanitized_issues,
-            "feature_requests": sanitized_feature_requests,
+        return {
+            "id": token_hex(16),
+            "agent_name": self._sanitize_input(feedback.agent_name),
+            "agent_type": self._sanitize_input(feedback.agent_type) if feedback.agent_type else None,
+            "submission_time": datetime.now().isoformat(),
+            "issues": self._sanitize_input(feedback.issues) if feedback.issues else None,
+            "feature_requests": self._sanitize_input(feedback.feature_requests) if feedback.feature_requests else None,
             "usability_rating": feedback.usability_rating,
-            "additional_comments": sanitized_additional_comments
+            "additional_comments": self._sanitize_input(feedback.additional_comments) if feedback.additional_comments else None
         }
+    
+    def _to_model(self, record: Dict[str, Any]) -> Feedback:
+        """Convert a stored feedback record to a Feedback model."""
+        return Feedback(**{**record, "submission_time": datetime.fromisoformat(record["submission_time"])})
+    
+    def add_feedback(self, feedback: FeedbackCreate) -> Feedback:
+        """Add a new feedback entry."""
+        new_feedback = self._build_record(feedback)
+        
+        # Hold the file lock across load and save so concurrent submissions aren't lost
+        with self._lock:
+            data = self._load_data()
+            data.append(new_feedback)
+            self._save_data(data)
+        
+        return self._to_model(new_feedback)
+    
+    def add_feedback_bulk(self, feedback_entries: Iterable[FeedbackCreate]) -> List[Feedback]:
+        """Add several feedback entries with a single load and save of the data file."""
+        # Validate everything up front so a bad entry leaves the file untouched
+        new_entries = [self._build_record(feedback) for feedback in feedback_entries]
+        if not new_entries:
+            return []
         
-        data.append(new_feedback)
-        self._save_data(data)
+        with self._lock:
+            data = self._load_data()
+            data.extend(new_entries)
+            self._save_data(data)
         
-        return Feedback(
-            id=feedback_id,
-            agent_name=sanitized_agent_name,
-            agent_type=sanitized_agent_type,
-            submission_time=datetime.fromisoformat(submission_time),
-            issues=sanitized_issues,
-            feature_requests=sanitized_feature_requests,
-            usability_rating=feedback.usability_rating,
-            additional_comments=sanitized_additional_comments
-        ) 
\ No newline at end of file
+        return [self._to_model(record) for record in new_entries]
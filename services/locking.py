@@ -0,0 +1,99 @@
+import os
+import re
+import json
+import fcntl
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, IO, Iterator
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger("graysky_api.locking")
+
+def _multiple_workers() -> bool:
+    """Check whether WEB_CONCURRENCY asks for more than one worker process."""
+    value = os.environ.get("WEB_CONCURRENCY", "").strip()
+    if not value:
+        return False
+    try:
+        return int(value) > 1
+    except ValueError:
+        # Locking when it isn't needed only costs a syscall, while skipping it could lose writes
+        logger.warning(f"Invalid WEB_CONCURRENCY {value!r}, using file locks")
+        return True
+
+# Only take cross-process flocks when several worker processes may share the data files;
+# a single-process server is fully covered by the in-process locks below
+USE_FLOCK = os.environ.get("USE_FLOCK") == "1" or _multiple_workers()
+
+# Per-file locks shared by every service instance in this process
+_file_locks: Dict[str, threading.RLock] = {}
+_file_locks_guard = threading.Lock()
+
+def get_file_lock(path: Path) -> threading.RLock:
+    """Get the in-process lock guarding a data file."""
+    with _file_locks_guard:
+        return _file_locks.setdefault(str(path.resolve()), threading.RLock())
+
+@contextmanager
+def flock(f: IO, operation: int) -> Iterator[None]:
+    """Hold an flock on an open file when running with multiple worker processes."""
+    if not USE_FLOCK:
+        yield
+        return
+
+    fcntl.flock(f, operation)
+    try:
+        yield
+    finally:
+        # Release the lock
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+# Translation table equivalent to html.escape(quote=True), applied in a single pass
+ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+# A number of 19 or more digits may not fit in 64 bits, which orjson would read back as a float
+_WIDE_INT = re.compile(rb"[\[:,]\s*-?\d{19}")
+
+def load_json(content: bytes) -> Any:
+    """Parse the contents of a JSON data file, accepting everything the stdlib json module writes."""
+    # Files written with json.dump, by older versions or for integers orjson can't encode, may hold
+    # NaN or Infinity, which orjson rejects, or integers wider than 64 bits
+    if not _WIDE_INT.search(content):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(content))
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """
+    Write data to a JSON file by swapping in a new file rather than truncating it in place.
+    
+    Readers that have the current file memory-mapped keep a complete copy of it. Callers hold
+    the file's locks, as the replacement is only atomic with respect to readers.
+    """
+    try:
+        # orjson encodes the records in one C-level pass straight to bytes
+        content = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        # orjson can't encode integers wider than 64 bits, which requests may carry in answers
+        content = json.dumps(data, default=str, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as tmp:
+        try:
+            os.fchmod(tmp.fileno(), os.stat(path).st_mode & 0o777)
+            tmp.write(content)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, path)
@@ -1,13 +1,19 @@
 import json
 import os
-import uuid
 import re
-import html
 import fcntl
+import heapq
+import mmap
+from contextlib import closing
+from itertools import pairwise
+from secrets import token_hex
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+import ijson
+
+from services.locking import ESCAPE_TABLE, atomic_write_json, flock, get_file_lock, load_json
 from models.visitor import Visitor, VisitorCreate
 from models.feedback import Feedback
 
@@ -16,6 +22,8 @@ class VisitorService:
         self.data_file = data_file
         self.data_path = Path(data_file)
         self._ensure_data_file_exists()
+        # Serializes access to the data file across requests handled by this process
+        self._lock = get_file_lock(self.data_path)
         
         # Maximum allowed length for text fields
         self.max_name_length = 100
@@ -38,7 +46,7 @@ class VisitorService:
             return ""
             
         # Strip any potentially dangerous HTML/script tags
-        sanitized = html.escape(text)
+        sanitized = text.translate(ESCAPE_TABLE)
         
         # Restrict to reasonable length
         return sanitized[:self.max_field_length]
@@ -65,8 +73,15 @@ class VisitorService:
         if visitor.answers:
             if not isinstance(visitor.answers, dict):
                 errors["answers"] = "Answers must be a dictionary"
-            elif len(json.dumps(visitor.answers)) > 2000:  # Limit overall size
-                errors["answers"] = "Answers exceeded maximum allowed size"
+            else:
+                # Estimate overall size, serializing only non-string values and stopping as soon as the limit is passed
+                total = 0
+                for key, value in visitor.answers.items():
+                    total += len(key)
+                    total += len(value) if isinstance(value, str) else len(json.dumps(value, default=str))
+                    if total > 2000:  # Limit overall size
+                        errors["answers"] = "Answers exceeded maximum allowed size"
+                        break
         
         # Validate feedback if provided
         if visitor.feedback:
@@ -87,58 +102,76 @@ class VisitorService:
     
     def _load_data(self) -> List[Dict[str, Any]]:
         """Load visitor data from file with file locking."""
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            # Acquire shared lock for reading
-            fcntl.flock(f, fcntl.LOCK_SH)
+        # Acquire shared lock for reading
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_SH):
+            # Parse straight from a read-only memory map to skip copying the file into a str
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return load_json(view)
+    
+    def _iter_data(self) -> Iterator[Dict[str, Any]]:
+        """Stream visitor records from file one at a time with file locking."""
+        # Acquire shared lock for reading
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_SH):
+            streamed = 0
             try:
-                return json.load(f)
-            finally:
-                # Release the lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+                for item in ijson.items(f, 'item', use_float=True):
+                    yield item
+                    streamed += 1
+            except ijson.JSONError:
+                # ijson rejects NaN, Infinity and integers wider than 64 bits, which files written with
+                # json.dump may hold, so parse the whole file instead and carry on after the records already streamed
+                f.seek(0)
+                yield from load_json(f.read())[streamed:]
     
     def _save_data(self, data: List[Dict[str, Any]]):
         """Save visitor data to file with exclusive locking."""
         # Keep only the most recent visitors if we exceed the limit
         if len(data) > self.max_visitors:
-            # Sort by visit time (convert to datetime for sorting)
-            data.sort(key=lambda x: datetime.fromisoformat(x['visit_time']), reverse=True)
-            # Keep only the most recent ones
-            data = data[:self.max_visitors]
+            # Records are only ever appended with the current time, so in a file kept in append order
+            # the last ones are the most recent. Files trimmed by older versions were stored newest first,
+            # so put a file that is out of order back in time order once; ISO timestamps sort as strings
+            if any(a['visit_time'] > b['visit_time'] for a, b in pairwise(data)):
+                data.sort(key=lambda item: item['visit_time'])
+            data = data[-self.max_visitors:]
             
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            # Acquire exclusive lock for writing
-            fcntl.flock(f, fcntl.LOCK_EX)
-            try:
-                json.dump(data, f, default=str, indent=2)
-            finally:
-                # Release the lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+        # Acquire exclusive lock for writing
+        with self._lock, open(self.data_path, 'rb') as f, flock(f, fcntl.LOCK_EX):
+            atomic_write_json(self.data_path, data)
     
     def get_visitors(self, limit: int = 10) -> List[Visitor]:
         """Get recent visitors."""
         # Ensure limit is reasonable
         limit = min(max(1, limit), 100)  # Between 1 and 100
         
-        data = self._load_data()
-        
-        # Convert to Visitor models and sort by visit time (most recent first)
-        visitors = [
-            Visitor(
-                id=item['id'],
-                name=item['name'],
-                agent_type=item.get('agent_type'),
-                purpose=item.get('purpose'),
-                visit_time=datetime.fromisoformat(item['visit_time']),
-                answers=item.get('answers', {})
-            )
-            for item in data
-        ]
+        # Stream records and keep only the most recent ones; ISO timestamps sort chronologically as strings
+        recent = heapq.nlargest(limit, self._iter_data(), key=lambda item: item['visit_time'])
         
-        visitors.sort(key=lambda x: x.visit_time, reverse=True)
-        return visitors[:limit]
+        # Records are stored with every model field and were validated on insert,
+        # so pass them straight through without re-running validation
+        visitors = []
+        for item in recent:
+            item['visit_time'] = datetime.fromisoformat(item['visit_time'])
+            # model_construct only fills fields that have a default, so older records without answers need one
+            item.setdefault('answers', {})
+            # Embedded feedback is stored without an id and is not part of the listing
+            item.pop('feedback', None)
+            visitors.append(Visitor.model_construct(**item))
+        return visitors
     
-    def add_visitor(self, visitor: VisitorCreate) -> Visitor:
-        """Add a new visitor to the welcome book."""
+    def get_visitor(self, visitor_id: str) -> Optional[Visitor]:
+        """Get a single visitor by id."""
+        # Stream records and stop at the first match; closing releases the file locks straight away
+        with closing(self._iter_data()) as records:
+            for item in records:
+                if item.get('id') == visitor_id:
+                    item['visit_time'] = datetime.fromisoformat(item['visit_time'])
+                    item.setdefault('answers', {})
+                    item.pop('feedback', None)
+                    return Visitor.model_construct(**item)
+        return None
+    
+    def _build_record(self, visitor: VisitorCreate, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate and sanitize a visitor against existing data into a record ready to store."""
         # Validate input
         errors = self._validate_visitor(visitor)
         if errors:
@@ -174,9 +207,6 @@ class VisitorService:
                 "submission_time": datetime.now().isoformat()
             }
         
-        # Load existing data
-        data = self._load_data()
-        
         # Check for rate limiting - visitors with same name within the past hour
         recent_visits = [
             item for item in data 
@@ -200,30 +230,58 @@ class VisitorService:
         if existing_visitor:
             visit_count = existing_visitor.get('visit_count', 1) + 1
         
-        visitor_id = str(uuid.uuid4())
-        visit_time = datetime.now().isoformat()
-        
-        new_visitor = {
-            "id": visitor_id,
+        return {
+            "id": token_hex(16),
             "name": sanitized_name,
             "agent_type": sanitized_agent_type,
             "purpose": sanitized_purpose,
-            "visit_time": visit_time,
+            "visit_time": datetime.now().isoformat(),
             "visit_count": visit_count,
             "answers": sanitized_answers or {},
             "feedback": sanitized_feedback
         }
-        
-        data.append(new_visitor)
-        self._save_data(data)
-        
+    
+    def _to_model(self, record: Dict[str, Any]) -> Visitor:
+        """Convert a stored visitor record to a Visitor model."""
         return Visitor(
-            id=visitor_id,
-            name=sanitized_name,
-            agent_type=sanitized_agent_type,
-            purpose=sanitized_purpose,
-            visit_time=datetime.fromisoformat(visit_time),
-            visit_count=visit_count,
-            answers=sanitized_answers or {},
-            feedback=Feedback(**sanitized_feedback) if sanitized_feedback else None
+            id=record["id"],
+            name=record["name"],
+            agent_type=record["agent_type"],
+            purpose=record["purpose"],
+            visit_time=datetime.fromisoformat(record["visit_time"]),
+            visit_count=record["visit_count"],
+            answers=record["answers"],
+            feedback=Feedback(**record["feedback"]) if record["feedback"] else None
         )
+    
+    def add_visitor(self, visitor: VisitorCreate) -> Visitor:
+        """Add a new visitor to the welcome book."""
+        # Hold the file lock across load and save so concurrent visits aren't lost
+        with self._lock:
+            # Load existing data
+            data = self._load_data()
+            
+            new_visitor = self._build_record(visitor, data)
+            data.append(new_visitor)
+            self._save_data(data)
+        
+        return self._to_model(new_visitor)
+    
+    def add_visitor_bulk(self, visitors: Iterable[VisitorCreate]) -> List[Visitor]:
+        """Add several visitors with a single load and save of the data file."""
+        with self._lock:
+            # Load existing data
+            data = self._load_data()
+            
+            # Each record is checked against the data including earlier entries in the batch,
+            # and nothing is written unless every entry is accepted
+            new_visitors = []
+            for visitor in visitors:
+                new_visitor = self._build_record(visitor, data)
+                data.append(new_visitor)
+                new_visitors.append(new_visitor)
+            
+            if new_visitors:
+                self._save_data(data)
+        
+        return [self._to_model(record) for record in new_visitors]
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import httpx
 import requests
 import json
 import sys
 from datetime import datetime
 from tabulate import tabulate
-import time
 
 BASE_URL = "http://localhost:8000"
 
@@ -83,7 +84,7 @@ def showcase_feedback():
     response = requests.post(f"{BASE_URL}/feedback", json=feedback_data)
     display_response(response, "POST /feedback")
 
-def showcase_content_endpoints():
+async def showcase_content_endpoints():
     """Showcase content endpoints."""
     print("\nSHOWCASE: Content Endpoints")
     print("=" * 80)
@@ -95,11 +96,13 @@ def showcase_content_endpoints():
         {"path": "/projects", "name": "Projects List"}
     ]
     
-    for endpoint in endpoints:
+    # Fetch all endpoints concurrently, then display the responses in order
+    async with httpx.AsyncClient(base_url=BASE_URL, follow_redirects=True) as client:
+        responses = await asyncio.gather(*[client.get(endpoint["path"]) for endpoint in endpoints])
+    
+    for endpoint, response in zip(endpoints, responses):
         print(f"\nAccessing {endpoint['name']}...")
-        response = requests.get(f"{BASE_URL}{endpoint['path']}")
         display_response(response, f"GET {endpoint['path']}")
-        time.sleep(1)  # Small delay to not flood the output
 
 def main():
     parser = argparse.ArgumentParser(description='Graysky Agent API Showcase Utility')
@@ -139,14 +142,14 @@ def main():
     if args.all or (not args.welcome and not args.feedback and not args.content):
         showcase_welcome_book()
         showcase_feedback()
-        showcase_content_endpoints()
+        asyncio.run(showcase_content_endpoints())
     else:
         if args.welcome:
             showcase_welcome_book()
         if args.feedback:
             showcase_feedback()
         if args.content:
-            showcase_content_endpoints()
+            asyncio.run(showcase_content_endpoints())
     
     print("\nShowcase complete!")
 
@@ -31,10 +31,13 @@ def read_file(filename):
         return set()
 
 def write_file(filename, contents):
+    header = (
+        "# THIS FILE IS AUTO-GENERATED - DO NOT EDIT DIRECTLY\n"
+        "# Use sync_ignore_files.py to update this file\n\n"
+    )
+    # Build the whole file up front and write it in one call
     with open(filename, 'w') as f:
-        f.write("# THIS FILE IS AUTO-GENERATED - DO NOT EDIT DIRECTLY\n")
-        f.write("# Use sync_ignore_files.py to update this file\n\n")
-        f.write('\n'.join(sorted(contents)) + '\n')
+        f.write(header + '\n'.join(sorted(contents)) + '\n')
 
 def main():
     # Read both files
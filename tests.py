@@ -1,11 +1,16 @@
 import json
 import os
 import pytest
+import uuid
 from fastapi.testclient import TestClient
 from pathlib import Path
 
 # Import main application
 from main import app
+from api.endpoints.welcome_book import get_visitor_service
+from models.visitor import FeedbackCreate, VisitorCreate
+from services.feedback_service import FeedbackService
+from services.visitor_service import VisitorService
 
 # Create test client
 client = TestClient(app)
@@ -28,6 +33,14 @@ def setup_test_welcome_book():
     
     return test_file
 
+# Point the welcome book endpoints at a fresh data file for a single test
+@pytest.fixture
+def temp_welcome_book(tmp_path):
+    data_file = tmp_path / "welcome_book.json"
+    app.dependency_overrides[get_visitor_service] = lambda: VisitorService(str(data_file))
+    yield data_file
+    app.dependency_overrides.pop(get_visitor_service, None)
+
 # Test the home endpoint
 def test_home_endpoint():
     response = client.get("/")
@@ -100,6 +113,154 @@ def test_welcome_book_post():
     assert data["answers"]["model"] == test_visitor["answers"]["model"]
     assert data["answers"]["purpose"] == test_visitor["answers"]["purpose"]
 
+# Test the welcome book POST endpoint with an integer wider than 64 bits
+def test_welcome_book_post_big_int(temp_welcome_book):
+    test_visitor = {
+        "name": "BigInt Agent",
+        "answers": {"n": 100000000000000000000000000000}
+    }
+    
+    # Post to welcome book
+    response = client.post("/welcome-book", json=test_visitor)
+    assert response.status_code == 200
+    data = response.json()
+    
+    # Verify the integer was kept exactly
+    assert data["answers"]["n"] == test_visitor["answers"]["n"]
+    assert json.loads(temp_welcome_book.read_text())[0]["answers"]["n"] == test_visitor["answers"]["n"]
+
+# Test the welcome book endpoints with a file written by older versions using json.dump
+def test_welcome_book_legacy_file(temp_welcome_book):
+    # json.dump writes NaN and integers wider than 64 bits, which orjson and ijson can't read
+    legacy_visitors = [
+        {"id": "legacy-nan", "name": "NaN Agent", "visit_time": "2024-01-01T00:00:00", "answers": {"v": float("nan")}},
+        {"id": "legacy-big", "name": "BigInt Agent", "visit_time": "2024-01-02T00:00:00", "answers": {"n": 10**29}},
+    ]
+    with open(temp_welcome_book, "w") as f:
+        json.dump(legacy_visitors, f, indent=2)
+    
+    # Look up a legacy visitor by id
+    response = client.get("/welcome-book/legacy-big")
+    assert response.status_code == 200
+    assert response.json()["answers"]["n"] == 10**29
+    
+    # Signing the welcome book still works
+    response = client.post("/welcome-book", json={"name": "Legacy Test Agent"})
+    assert response.status_code == 200
+    
+    # The newest visitors include the legacy one, with its integer kept exact
+    response = client.get("/welcome-book?limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [visitor["name"] for visitor in data] == ["Legacy Test Agent", "BigInt Agent"]
+    assert data[1]["answers"]["n"] == 10**29
+
+# Test trimming a full welcome book that older versions stored newest first
+def test_welcome_book_trim_legacy_order(temp_welcome_book):
+    legacy_visitors = [
+        {"id": f"legacy-{i}", "name": f"Legacy Agent {i}", "visit_time": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "answers": {}}
+        for i in range(1000)
+    ]
+    with open(temp_welcome_book, "w") as f:
+        json.dump(legacy_visitors[::-1], f, indent=2)
+    
+    # Signing a full welcome book drops the oldest visitor
+    response = client.post("/welcome-book", json={"name": "Trim Test Agent"})
+    assert response.status_code == 200
+    
+    stored_ids = [visitor["id"] for visitor in json.loads(temp_welcome_book.read_text())]
+    assert len(stored_ids) == 1000
+    assert "legacy-0" not in stored_ids
+    assert "legacy-1" in stored_ids and "legacy-999" in stored_ids
+    assert stored_ids[-1] == response.json()["id"]
+
+# Test the welcome book GET by id endpoint
+def test_welcome_book_get_by_id():
+    # Sign the welcome book with a unique name so the per-name rate limit never applies
+    test_visitor = {
+        "name": f"Lookup Test Agent {uuid.uuid4().hex[:8]}",
+        "agent_type": "Test Suite",
+        "purpose": "Testing visitor lookup",
+        "answers": {"model": "Test Framework"}
+    }
+    post_response = client.post("/welcome-book", json=test_visitor)
+    assert post_response.status_code == 200
+    visitor_id = post_response.json()["id"]
+    
+    # Look the new visitor up by id
+    response = client.get(f"/welcome-book/{visitor_id}")
+    assert response.status_code == 200
+    data = response.json()
+    
+    # Verify the stored visitor is returned
+    assert data["id"] == visitor_id
+    assert data["name"] == test_visitor["name"]
+    assert data["answers"]["model"] == test_visitor["answers"]["model"]
+
+# Test error handling for non-existent visitor
+def test_welcome_book_get_by_id_not_found():
+    response = client.get("/welcome-book/this-visitor-does-not-exist")
+    assert response.status_code == 404
+    data = response.json()
+    
+    # Should return error detail
+    assert "detail" in data
+
+# Test that a rejected visitor leaves the welcome book untouched by the rest of its batch
+def test_visitor_service_bulk_rejected_entry(tmp_path):
+    data_file = tmp_path / "welcome_book.json"
+    service = VisitorService(str(data_file))
+    service.add_visitor(VisitorCreate(name="Existing Agent"))
+    before = data_file.read_bytes()
+    
+    # The second visitor has no name, so the whole batch is rejected
+    with pytest.raises(ValueError):
+        service.add_visitor_bulk([VisitorCreate(name="Bulk Agent"), VisitorCreate(name="")])
+    assert data_file.read_bytes() == before
+    
+    # A valid batch is stored in order after the existing visitor
+    added = service.add_visitor_bulk([VisitorCreate(name="Bulk Agent 1"), VisitorCreate(name="Bulk Agent 2")])
+    assert [visitor.name for visitor in added] == ["Bulk Agent 1", "Bulk Agent 2"]
+    stored = json.loads(data_file.read_text())
+    assert [visitor["name"] for visitor in stored] == ["Existing Agent", "Bulk Agent 1", "Bulk Agent 2"]
+
+# Test that the per-name rate limit applies between visitors in the same batch
+def test_visitor_service_bulk_rate_limit(tmp_path):
+    data_file = tmp_path / "welcome_book.json"
+    service = VisitorService(str(data_file))
+    before = data_file.read_bytes()
+    
+    with pytest.raises(ValueError, match="Rate limit"):
+        service.add_visitor_bulk([VisitorCreate(name="Repeat Agent"), VisitorCreate(name="Repeat Agent")])
+    assert data_file.read_bytes() == before
+    
+    # Visitors already in the file count too
+    service.add_visitor(VisitorCreate(name="Repeat Agent"))
+    with pytest.raises(ValueError, match="Rate limit"):
+        service.add_visitor_bulk([VisitorCreate(name="Other Agent"), VisitorCreate(name="Repeat Agent")])
+    assert [visitor["name"] for visitor in json.loads(data_file.read_text())] == ["Repeat Agent"]
+
+# Test that a rejected feedback entry leaves the feedback file untouched by the rest of its batch
+def test_feedback_service_bulk_rejected_entry(tmp_path):
+    data_file = tmp_path / "feedback.json"
+    service = FeedbackService(str(data_file))
+    service.add_feedback(FeedbackCreate(agent_name="Existing Agent"))
+    before = data_file.read_bytes()
+    
+    # The second entry's rating is out of range, so the whole batch is rejected
+    with pytest.raises(ValueError):
+        service.add_feedback_bulk([
+            FeedbackCreate(agent_name="Bulk Agent", usability_rating=5),
+            FeedbackCreate(agent_name="Bulk Agent", usability_rating=11),
+        ])
+    assert data_file.read_bytes() == before
+    
+    # A valid batch is stored in order after the existing entry
+    added = service.add_feedback_bulk([FeedbackCreate(agent_name="Bulk Agent 1"), FeedbackCreate(agent_name="Bulk Agent 2")])
+    assert [feedback.agent_name for feedback in added] == ["Bulk Agent 1", "Bulk Agent 2"]
+    stored = json.loads(data_file.read_text())
+    assert [feedback["agent_name"] for feedback in stored] == ["Existing Agent", "Bulk Agent 1", "Bulk Agent 2"]
+
 # Test the articles collection endpoint
 def test_articles_endpoint():
     response = client.get("/articles")
@@ -198,6 +359,25 @@ def test_welcome_book_validation():
     # Should return validation error
     assert "detail" in data
 
+# Test welcome book validation - oversized nested answer
+def test_welcome_book_nested_answers_size(temp_welcome_book):
+    # Non-string answer values count towards the size limit too
+    test_visitor = {
+        "name": "Nested Answers Agent",
+        "agent_type": "Test Suite",
+        "answers": {
+            "details": {"nested": "x" * 3000}
+        }
+    }
+    
+    # Post to welcome book
+    response = client.post("/welcome-book", json=test_visitor)
+    assert response.status_code == 400
+    data = response.json()
+    
+    # Should be rejected by the service's answers size check, not the endpoint's own length check
+    assert "Answers exceeded maximum allowed size" in data["detail"]
+
 # Test welcome book with missing fields
 def test_welcome_book_missing_fields():
     # Test visitor with missing required fields
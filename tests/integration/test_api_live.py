@@ -1,26 +1,8 @@
 import unittest
 import os
-import requests
-import time
-import subprocess
-import signal
-import sys
-from multiprocessing import Process
 
 # Default test server URL
 TEST_SERVER_URL = os.environ.get("TEST_SERVER_URL", "http://localhost:8080")
-# Whether to start a test server or use an existing one
-START_TEST_SERVER = os.environ.get("START_TEST_SERVER", "True").lower() == "true"
-
-def start_server():
-    """Start a test server instance."""
-    # Run uvicorn with the main app
-    subprocess.Popen(
-        [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8080"],
-        env=dict(os.environ, **{"TESTING": "True"})
-    )
-    # Give the server time to start
-    time.sleep(3)
 
 class TestLiveApi(unittest.TestCase):
     """Test the API against a live server."""
@@ -28,22 +10,20 @@ class TestLiveApi(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment."""
-        if START_TEST_SERVER:
-            cls.server_process = Process(target=start_server)
-            cls.server_process.start()
-            # Give time for server to start
-            time.sleep(3)
+        # Share one session so requests reuse keep-alive connections
+        # The server itself is started once for the whole run by tests/run_tests.py
+        # Imported here so discovery for other test types doesn't pay for requests
+        import requests
+        cls.session = requests.Session()
     
     @classmethod
     def tearDownClass(cls):
         """Clean up after tests."""
-        if START_TEST_SERVER and hasattr(cls, 'server_process'):
-            cls.server_process.terminate()
-            cls.server_process.join(timeout=2)
+        cls.session.close()
     
     def test_health_endpoint(self):
         """Test the health endpoint."""
-        response = requests.get(f"{TEST_SERVER_URL}/health")
+        response = self.session.get(f"{TEST_SERVER_URL}/health")
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertIn("status", data)
@@ -53,6 +33,8 @@ class TestLiveApi(unittest.TestCase):
     
     def test_welcome_book_workflow(self):
         """Test creating and retrieving welcome book entries."""
+        import ijson
+        
         # Test visitor data
         test_visitor = {
             "name": "Test Integration Agent",
@@ -66,7 +48,7 @@ class TestLiveApi(unittest.TestCase):
         }
         
         # Post to welcome book
-        response = requests.post(f"{TEST_SERVER_URL}/welcome-book", json=test_visitor)
+        response = self.session.post(f"{TEST_SERVER_URL}/welcome-book", json=test_visitor)
         self.assertEqual(response.status_code, 200)
         post_data = response.json()
         
@@ -75,16 +57,17 @@ class TestLiveApi(unittest.TestCase):
         self.assertEqual(post_data["agent_type"], test_visitor["agent_type"])
         self.assertIn("id", post_data)
         
-        # Get the welcome book entries
-        response = requests.get(f"{TEST_SERVER_URL}/welcome-book")
-        self.assertEqual(response.status_code, 200)
-        get_data = response.json()
-        
-        # Verify our entry exists
-        self.assertIsInstance(get_data, list)
-        # Find our entry
-        matching_entries = [entry for entry in get_data if entry.get("id") == post_data["id"]]
-        self.assertEqual(len(matching_entries), 1)
+        # Get the welcome book entries, streaming the list so parsing stops at our entry
+        with self.session.get(f"{TEST_SERVER_URL}/welcome-book", stream=True) as response:
+            self.assertEqual(response.status_code, 200)
+            response.raw.decode_content = True
+            
+            # Find our entry
+            found = any(
+                entry.get("id") == post_data["id"]
+                for entry in ijson.items(response.raw, "item")
+            )
+        self.assertTrue(found)
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
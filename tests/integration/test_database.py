@@ -2,30 +2,40 @@ import unittest
 import os
 import tempfile
 import json
-import requests
-import shutil
 import sqlite3
 from database.connection import DatabaseConnection
 from database.schema import create_tables
 
 # Default test server URL
 TEST_SERVER_URL = os.environ.get("TEST_SERVER_URL", "http://localhost:8080")
+# Memory-backed directory for test databases, falling back to the default temp dir
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
 class TestDatabaseIntegration(unittest.TestCase):
     """Test database operations through the API."""
     
-    def setUp(self):
-        """Set up the test environment."""
-        # Create a temporary database file for testing
-        self.temp_dir = tempfile.mkdtemp()
-        self.db_path = os.path.join(self.temp_dir, "test_integration.db")
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test database and a shared session once for the whole class."""
+        # Imported here so discovery for other test types doesn't pay for requests
+        import requests
+        # Share one session so requests reuse keep-alive connections
+        cls.session = requests.Session()
+        
+        # Create a temporary database file for testing, on tmpfs where available so
+        # commits never touch the disk; the API runs in its own process so it can't be :memory:
+        cls.temp_dir = tempfile.mkdtemp(dir=SHM_DIR)
+        cls.db_path = os.path.join(cls.temp_dir, "test_integration.db")
         
         # Set the database path in the environment for the API to use
-        os.environ["DATABASE_PATH"] = self.db_path
+        os.environ["DATABASE_PATH"] = cls.db_path
         
         # Initialize the database
-        self.db = DatabaseConnection(self.db_path)
-        with self.db.get_connection() as conn:
+        cls.db = DatabaseConnection(cls.db_path)
+        with cls.db.get_connection() as conn:
+            # WAL is stored in the database file itself, so unlike the per-connection pragmas
+            # it carries over to every later connection to the test database
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS schema_version (
                     version INTEGER PRIMARY KEY,
@@ -35,10 +45,17 @@ class TestDatabaseIntegration(unittest.TestCase):
             """)
         create_tables()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up after tests."""
-        # Remove temporary directory and database
-        shutil.rmtree(self.temp_dir)
+        cls.session.close()
+        # Remove the database and its SQLite sidecar files, then the now empty directory
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.unlink(cls.db_path + suffix)
+            except FileNotFoundError:
+                pass
+        os.rmdir(cls.temp_dir)
         # Reset environment variable
         if "DATABASE_PATH" in os.environ:
             del os.environ["DATABASE_PATH"]
@@ -53,7 +70,7 @@ class TestDatabaseIntegration(unittest.TestCase):
             "answers": {"test": "value"}
         }
         
-        response = requests.post(f"{TEST_SERVER_URL}/welcome-book", json=test_visitor)
+        response = self.session.post(f"{TEST_SERVER_URL}/welcome-book", json=test_visitor)
         self.assertEqual(response.status_code, 200)
         visitor_data = response.json()
         visitor_id = visitor_data["id"]
@@ -84,7 +101,7 @@ class TestDatabaseIntegration(unittest.TestCase):
             "additional_comments": "Integration test comments"
         }
         
-        response = requests.post(f"{TEST_SERVER_URL}/feedback", json=test_feedback)
+        response = self.session.post(f"{TEST_SERVER_URL}/feedback", json=test_feedback)
         self.assertEqual(response.status_code, 200)
         feedback_data = response.json()
         
@@ -97,21 +114,8 @@ class TestDatabaseIntegration(unittest.TestCase):
     
     def test_transaction_integrity(self):
         """Test database transaction integrity."""
-        # This test will verify that transactions are atomic
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            # Set up a trigger to enforce a constraint
-            cursor.execute("""
-                CREATE TRIGGER enforce_valid_rating
-                BEFORE INSERT ON feedback
-                BEGIN
-                    SELECT CASE
-                        WHEN NEW.usability_rating < 0 OR NEW.usability_rating > 10
-                        THEN RAISE(ABORT, 'Rating must be between 0 and 10')
-                    END;
-                END;
-            """)
-        
+        # This test will verify that transactions are atomic; the enforce_valid_rating
+        # trigger created with the schema rejects the out of range rating
         # Try to submit invalid feedback (rating out of range)
         test_feedback = {
             "agent_name": "DB Transaction Test",
@@ -122,7 +126,7 @@ class TestDatabaseIntegration(unittest.TestCase):
             "additional_comments": "Transaction test comments"
         }
         
-        response = requests.post(f"{TEST_SERVER_URL}/feedback", json=test_feedback)
+        response = self.session.post(f"{TEST_SERVER_URL}/feedback", json=test_feedback)
         # Should get an error response
         self.assertNotEqual(response.status_code, 200)
         
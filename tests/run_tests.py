@@ -9,8 +9,13 @@ import sys
 import os
 import argparse
 import logging
+import subprocess
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -25,13 +30,119 @@ PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 # Add project root to Python path
 sys.path.insert(0, str(PROJECT_ROOT))
 
-def run_tests(test_types: Optional[List[str]] = None) -> int:
+# Module path prefixes for the test categories that live under tests/
+TEST_MODULE_PREFIXES = {
+    "unit": "tests.unit.",
+    "integration": "tests.integration.",
+    "health": "tests.health.",
+}
+
+# Server the integration tests run against
+TEST_SERVER_URL = os.environ.get("TEST_SERVER_URL", "http://localhost:8080")
+# Set to reuse an already running server instead of starting one for the run
+EXTERNAL_SERVER = bool(os.environ.get("EXTERNAL_SERVER"))
+
+def _iter_tests(suite: unittest.TestSuite) -> Iterator[unittest.TestCase]:
+    """Flatten a nested test suite into its individual test cases."""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+def _test_path(test: unittest.TestCase) -> str:
+    """Get the dotted path of a test case, starting with the module it was loaded from."""
+    # Modules that fail to import show up as unittest.loader._FailedTest.<module path>
+    return test.id().split("_FailedTest.", 1)[-1]
+
+def start_test_server() -> subprocess.Popen:
+    """
+    Start a uvicorn server for the integration tests and wait until it is ready.
+    
+    The server listens on the host and port of TEST_SERVER_URL. If it exits before becoming
+    ready, its exit code is left in the returned process's returncode.
+    """
+    logger.info("Starting test server...")
+    url = urllib.parse.urlsplit(TEST_SERVER_URL)
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", url.hostname or "127.0.0.1",
+            "--port", str(url.port or (443 if url.scheme == "https" else 80)),
+            "--loop", "uvloop", "--http", "httptools", "--workers", "1",
+        ],
+        cwd=PROJECT_ROOT,
+        env=dict(os.environ, **{"TESTING": "True"})
+    )
+    
+    # Poll the health endpoint until the server accepts requests
+    for _ in range(50):
+        if server.poll() is not None:
+            logger.error(f"Test server exited with code {server.returncode} before becoming ready")
+            break
+        try:
+            urllib.request.urlopen(f"{TEST_SERVER_URL}/health", timeout=0.2).close()
+            break
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+    else:
+        logger.warning(f"Test server did not become ready at {TEST_SERVER_URL}")
+    
+    return server
+
+def stop_test_server(server: subprocess.Popen) -> None:
+    """Stop the test server started by start_test_server."""
+    server.terminate()
+    try:
+        server.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+def run_tests_parallel(test_types: List[str], jobs: int) -> int:
+    """
+    Run tests across worker processes with unittest-parallel.
+    
+    Test classes are the unit of parallelism, so class-level fixtures such as the
+    shared sessions and test databases are still set up once per class.
+    
+    Args:
+        test_types: Test types to run
+        jobs: Number of worker processes (0 for one per CPU core)
+    
+    Returns:
+        int: 0 if all tests passed, 1 otherwise
+    """
+    base_command = [
+        sys.executable, "-m", "unittest_parallel",
+        "-j", str(jobs), "--level", "class", "-b",
+        "-t", str(PROJECT_ROOT), "-p", "test_*.py",
+    ]
+    commands = []
+    
+    # One discovery over tests/, filtered to the requested categories
+    prefixes = [TEST_MODULE_PREFIXES[test_type] for test_type in test_types if test_type in TEST_MODULE_PREFIXES]
+    if prefixes:
+        filters = [arg for prefix in prefixes for arg in ("-k", f"{prefix}*")]
+        commands.append(base_command + ["-s", str(PROJECT_ROOT / 'tests')] + filters)
+    
+    if "database" in test_types:
+        commands.append(base_command + ["-s", str(PROJECT_ROOT / 'database' / 'tests')])
+    
+    exit_code = 0
+    for command in commands:
+        result = subprocess.run(command, cwd=PROJECT_ROOT)
+        if result.returncode != 0:
+            exit_code = 1
+    return exit_code
+
+def run_tests(test_types: Optional[List[str]] = None, jobs: Optional[int] = None) -> int:
     """
     Run all tests for the API.
     
     Args:
         test_types: Optional list of test types to run. Options: "unit", "integration", "health", "database".
                    If None, all tests are run.
+        jobs: If set, run tests in parallel across this many worker processes (0 for one per CPU core)
     
     Returns:
         int: 0 if all tests passed, 1 otherwise
@@ -41,69 +152,61 @@ def run_tests(test_types: Optional[List[str]] = None) -> int:
     
     logger.info(f"Running test types: {', '.join(test_types)}")
     
+    # Start one server for every integration test in the run
+    server = None
+    if "integration" in test_types and not EXTERNAL_SERVER:
+        server = start_test_server()
+        if server.returncode is not None:
+            # Every integration test would fail to connect, so stop here with uvicorn's exit code
+            return server.returncode or 1
+    
+    try:
+        if jobs is not None:
+            return run_tests_parallel(test_types, jobs)
+        return run_tests_serial(test_types)
+    finally:
+        if server is not None:
+            stop_test_server(server)
+
+def run_tests_serial(test_types: List[str]) -> int:
+    """
+    Run tests in this process with the standard unittest runner.
+    
+    Args:
+        test_types: Test types to run
+    
+    Returns:
+        int: 0 if all tests passed, 1 otherwise
+    """
     # Set up the test loader
     test_loader = unittest.TestLoader()
     test_suite = unittest.TestSuite()
     
-    # Add unit tests
-    if "unit" in test_types:
-        logger.info("Loading unit tests...")
-        unit_tests_dir = os.path.join(PROJECT_ROOT, 'tests', 'unit')
-        if os.path.exists(unit_tests_dir):
-            unit_tests = test_loader.discover(unit_tests_dir, pattern='test_*.py')
-            test_suite.addTests(unit_tests)
-        else:
-            logger.warning(f"Unit tests directory not found: {unit_tests_dir}")
-    
-    # Add integration tests
-    if "integration" in test_types:
-        logger.info("Loading integration tests...")
-        integration_tests_dir = os.path.join(PROJECT_ROOT, 'tests', 'integration')
-        if os.path.exists(integration_tests_dir):
-            integration_tests = test_loader.discover(integration_tests_dir, pattern='test_*.py')
-            test_suite.addTests(integration_tests)
-        else:
-            logger.warning(f"Integration tests directory not found: {integration_tests_dir}")
-    
-    # Add health check tests
-    if "health" in test_types:
-        logger.info("Loading health check tests...")
-        health_tests_dir = os.path.join(PROJECT_ROOT, 'tests', 'health')
-        if os.path.exists(health_tests_dir):
-            health_tests = test_loader.discover(health_tests_dir, pattern='test_*.py')
-            test_suite.addTests(health_tests)
-        else:
-            logger.warning(f"Health tests directory not found: {health_tests_dir}")
+    # Discover everything under tests/ in one walk, then keep the requested categories
+    prefixes = tuple(TEST_MODULE_PREFIXES[test_type] for test_type in test_types if test_type in TEST_MODULE_PREFIXES)
+    if prefixes:
+        logger.info(f"Loading {', '.join(t for t in test_types if t in TEST_MODULE_PREFIXES)} tests...")
+        tests_dir = PROJECT_ROOT / 'tests'
+        discovered = test_loader.discover(str(tests_dir), pattern='test_*.py', top_level_dir=str(PROJECT_ROOT))
+        test_suite.addTests(
+            test for test in _iter_tests(discovered)
+            if _test_path(test).startswith(prefixes)
+        )
     
     # Add database tests
     if "database" in test_types:
         logger.info("Loading database tests...")
-        database_tests_dir = os.path.join(PROJECT_ROOT, 'database', 'tests')
-        if os.path.exists(database_tests_dir):
-            try:
-                # Load database tests individually
-                for file in Path(database_tests_dir).glob('test_*.py'):
-                    module_name = f"database.tests.{file.stem}"
-                    try:
-                        # Import the test module
-                        __import__(module_name)
-                        module = sys.modules[module_name]
-                        
-                        # Add all test cases from this module
-                        for name in dir(module):
-                            obj = getattr(module, name)
-                            if isinstance(obj, type) and issubclass(obj, unittest.TestCase) and obj != unittest.TestCase:
-                                test_suite.addTest(test_loader.loadTestsFromTestCase(obj))
-                                
-                    except (ImportError, AttributeError) as e:
-                        logger.error(f"Error loading test module {module_name}: {e}")
-            except Exception as e:
-                logger.error(f"Error discovering database tests: {e}")
+        database_tests_dir = PROJECT_ROOT / 'database' / 'tests'
+        if database_tests_dir.exists():
+            test_suite.addTests(
+                test_loader.discover(str(database_tests_dir), pattern='test_*.py', top_level_dir=str(PROJECT_ROOT))
+            )
         else:
             logger.warning(f"Database tests directory not found: {database_tests_dir}")
     
     # Run the tests
-    test_runner = unittest.TextTestRunner(verbosity=2)
+    # Buffer output so only failing tests print their stdout/stderr
+    test_runner = unittest.TextTestRunner(verbosity=2, buffer=True)
     result = test_runner.run(test_suite)
     
     # Return success or failure
@@ -119,6 +222,14 @@ if __name__ == "__main__":
         default=['all'],
         help="Types of tests to run"
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        nargs='?',
+        const=0,
+        default=None,
+        help="Run tests in parallel worker processes (default: one per CPU core)"
+    )
     
     args = parser.parse_args()
     
@@ -126,5 +237,5 @@ if __name__ == "__main__":
     test_types = None if 'all' in args.types else args.types
     
     # Run the tests
-    exit_code = run_tests(test_types)
+    exit_code = run_tests(test_types, args.jobs)
     sys.exit(exit_code) 
\ No newline at end of file
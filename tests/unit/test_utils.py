@@ -0,0 +1,330 @@
+"""
+Unit tests for the data review CLI helpers in utils.py.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from operator import itemgetter
+from pathlib import Path
+from unittest import mock
+
+import orjson
+
+import utils
+
+ENTRIES = [
+    {"id": "aaaa1111", "name": "first", "answers": {"note": '"id": "cccc'}},
+    {"id": "bbbb2222", "name": "second", "answers": {"id": "dddd9999"}},
+    {"id": "cccc3333", "name": "thïrd ✓", "answers": {}},
+    {"id": "éé444444", "name": "fourth", "answers": {"q": "ü"}},
+    {"id": "dddd5555", "name": "fifth", "answers": {"nested": {"id": "eeee"}}},
+]
+
+def write_entries(path, entries, layout="indent2"):
+    """Write entries to a JSON array file laid out as compact, indented by 2 as the services do, or indented by 4."""
+    if layout == "indent2":
+        path.write_bytes(orjson.dumps(entries, option=orjson.OPT_INDENT_2))
+    elif layout == "indent4":
+        path.write_text(json.dumps(entries, indent=4), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(entries), encoding="utf-8")
+
+class DataFileTestCase(unittest.TestCase):
+    """Base class for tests that read data files from a temporary directory."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "data.json"
+
+    def tearDown(self):
+        cache_dir = utils._cache_dir()
+        if cache_dir is not None:
+            for cache_file in cache_dir.glob(utils._cache_prefix(self.path) + "*"):
+                cache_file.unlink()
+        self.temp_dir.cleanup()
+
+class TestPresorted(unittest.TestCase):
+    """Test the check that takes entries straight from an already ordered list."""
+
+    def test_ascending(self):
+        """Oldest first lists are recognised at sizes around the sample windows."""
+        for n in (2, 5, 64, 126, 127, 128, 129, 1000):
+            with self.subTest(n=n):
+                data = list(range(n))
+                self.assertEqual(utils._presorted(data, int), data[::-1])
+                self.assertEqual(utils._presorted(data, int, 3), data[::-1][:3])
+
+    def test_descending(self):
+        """Newest first lists are recognised at sizes around the sample windows."""
+        for n in (2, 5, 64, 126, 127, 128, 129, 1000):
+            with self.subTest(n=n):
+                data = list(range(n))[::-1]
+                self.assertEqual(utils._presorted(data, int), data)
+                self.assertEqual(utils._presorted(data, int, 3), data[:3])
+
+    def test_unordered(self):
+        """Lists that are out of order within the sample are left for sorting."""
+        self.assertIsNone(utils._presorted([1, 3, 2], int))
+        self.assertIsNone(utils._presorted([0, 1, 2] + list(range(3, 1000))[::-1], int))
+
+    def test_entries(self):
+        """Entries are compared by the given key."""
+        data = [{"visit_time": f"2025-01-{day:02d}T00:00:00"} for day in range(1, 10)]
+        self.assertEqual(utils._presorted(data, itemgetter("visit_time"), 2), [data[8], data[7]])
+
+class TestLoadCached(DataFileTestCase):
+    """Test the parsed data cache kept between runs."""
+
+    def setUp(self):
+        super().setUp()
+        self.path.write_text('[{"id": "old"}]')
+
+    def test_reuses_cache_while_unchanged(self):
+        """An unchanged file is served from the cache without parsing it again."""
+        self.assertEqual(utils._load_cached(self.path), [{"id": "old"}])
+        with mock.patch.object(utils, "_load_json") as load_json:
+            self.assertEqual(utils._load_cached(self.path), [{"id": "old"}])
+        load_json.assert_not_called()
+
+    def test_write_during_parse(self):
+        """Entries parsed before a write are never served for the version written after it."""
+        load_json = utils._load_json
+
+        def load_then_write(path):
+            data = load_json(path)
+            self.path.write_text('[{"id": "new"}, {"id": "newer"}]')
+            os.utime(self.path, ns=(1, 1))
+            return data
+
+        with mock.patch.object(utils, "_load_json", load_then_write):
+            self.assertEqual(utils._load_cached(self.path), [{"id": "old"}])
+        self.assertEqual(utils._load_cached(self.path), [{"id": "new"}, {"id": "newer"}])
+
+class TestBuildIndex(DataFileTestCase):
+    """Test the index of entry byte ranges used for detail lookups."""
+
+    def test_layouts(self):
+        """Every indexed byte range holds exactly its entry, whatever the layout and encoding."""
+        for layout in ("compact", "indent2", "indent4"):
+            with self.subTest(layout=layout):
+                write_entries(self.path, ENTRIES, layout)
+                index = utils._build_index(self.path)
+                raw = self.path.read_bytes()
+                self.assertEqual(sorted(index), sorted(entry["id"][:utils._INDEX_KEY_LENGTH] for entry in ENTRIES))
+                for entry in ENTRIES:
+                    (start, end), = index[entry["id"][:utils._INDEX_KEY_LENGTH]]
+                    self.assertEqual(json.loads(raw[start:end]), entry)
+
+    def test_non_ascii_before_entries(self):
+        """Byte offsets stay right after earlier entries holding multi-byte characters."""
+        entries = [{"id": f"{i:08d}", "name": "✓" * i} for i in range(20)]
+        write_entries(self.path, entries)
+        index = utils._build_index(self.path)
+        raw = self.path.read_bytes()
+        start, end = index["00000019"][0]
+        self.assertEqual(orjson.loads(raw[start:end]), entries[19])
+
+    def test_shared_key(self):
+        """Ids sharing their leading characters keep every range, in file order."""
+        entries = [{"id": "abcdefgh1"}, {"id": "abcdefgh2"}]
+        write_entries(self.path, entries)
+        self.assertEqual(len(utils._build_index(self.path)["abcdefgh"]), 2)
+
+    def test_empty_array(self):
+        """An empty array gives an empty index."""
+        for text in ("[]", "[\n]", " [ ] "):
+            with self.subTest(text=text):
+                self.path.write_text(text)
+                self.assertEqual(utils._build_index(self.path), {})
+
+    def test_invalid(self):
+        """Empty and malformed files are reported as JSON errors."""
+        for text in ("", "{}", '[{"id": "a"} {"id": "b"}]'):
+            with self.subTest(text=text):
+                self.path.write_text(text)
+                with self.assertRaises(json.JSONDecodeError):
+                    utils._build_index(self.path)
+
+class TestFindEntry(DataFileTestCase):
+    """Test looking up a single entry by an id prefix."""
+
+    def assert_lookups(self):
+        """Check full ids, short prefixes and misses against the entries on disk."""
+        for entry in ENTRIES:
+            self.assertEqual(utils._find_entry(self.path, entry["id"]), entry)
+            self.assertEqual(utils._find_entry(self.path, entry["id"][:3]), entry)
+        # Ids nested in answers are never matched
+        self.assertIsNone(utils._find_entry(self.path, "eeee"))
+        self.assertEqual(utils._find_entry(self.path, "dddd"), ENTRIES[4])
+        self.assertIsNone(utils._find_entry(self.path, "zzzz"))
+        self.assertEqual(utils._find_entry(self.path, ""), ENTRIES[0])
+
+    def test_layouts(self):
+        """Entries are found in every layout, with and without a cache directory."""
+        for layout in ("compact", "indent2", "indent4"):
+            write_entries(self.path, ENTRIES, layout)
+            with self.subTest(layout=layout):
+                self.assert_lookups()
+            with self.subTest(layout=layout, cache=False), mock.patch.object(utils, "_cache_dir", return_value=None):
+                self.assert_lookups()
+
+    def test_first_match(self):
+        """Short prefixes return the first matching entry in the file."""
+        entries = [{"id": "ab2"}, {"id": "ab1"}, {"id": "abcdefgh1"}, {"id": "abcdefgh0"}]
+        write_entries(self.path, entries, "compact")
+        self.assertEqual(utils._find_entry(self.path, "ab"), entries[0])
+        self.assertEqual(utils._find_entry(self.path, "abcdefgh"), entries[2])
+        self.assertEqual(utils._find_entry(self.path, "abcdefgh0"), entries[3])
+
+    def test_empty_array(self):
+        """Nothing is found in an empty array."""
+        self.path.write_text("[]")
+        self.assertIsNone(utils._find_entry(self.path, "a"))
+
+class TestTailEntries(DataFileTestCase):
+    """Test reading the last entries of a data file backwards."""
+
+    def test_last_entries(self):
+        """The last entries come back last first, for any limit."""
+        write_entries(self.path, ENTRIES)
+        for limit in (1, 3, 5, 10):
+            with self.subTest(limit=limit):
+                self.assertEqual(utils._tail_entries(self.path, limit), ENTRIES[::-1][:limit])
+
+    def test_chunk_boundaries(self):
+        """Entries and lines split across read chunks are put back together."""
+        write_entries(self.path, ENTRIES)
+        for chunk_size in (1, 2, 3, 7, 16, 64):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(utils._tail_entries(self.path, 4, chunk_size=chunk_size), ENTRIES[::-1][:4])
+
+    def test_entry_longer_than_chunk(self):
+        """Entries and single lines longer than the default 64 KiB chunk are read whole."""
+        entries = [
+            {"id": "a", "answers": {f"q{i}": "x" * 100 for i in range(1000)}},
+            {"id": "b", "purpose": "y" * 200000},
+            {"id": "c"},
+        ]
+        write_entries(self.path, entries)
+        self.assertEqual(utils._tail_entries(self.path, 3), entries[::-1])
+
+    def test_empty_array(self):
+        """An empty array has no entries."""
+        for text in ("[]", "[]\n", "[\n]"):
+            with self.subTest(text=text):
+                self.path.write_text(text)
+                self.assertEqual(utils._tail_entries(self.path, 5), [])
+
+    def test_other_layouts(self):
+        """Files not laid out as the services write them are left for a full parse."""
+        for layout in ("compact", "indent4"):
+            with self.subTest(layout=layout):
+                write_entries(self.path, ENTRIES, layout)
+                self.assertIsNone(utils._tail_entries(self.path, 2))
+        for text in ("", "\n", "[\n  1,\n  2\n]", '  {\n    "id": "a"\n  }\n]'):
+            with self.subTest(text=text):
+                self.path.write_text(text)
+                self.assertIsNone(utils._tail_entries(self.path, 2))
+
+class TestCountEntries(DataFileTestCase):
+    """Test counting the entries of a data file without parsing it."""
+
+    def test_count(self):
+        """Only top level entries are counted."""
+        for count in (1, 5):
+            with self.subTest(count=count):
+                write_entries(self.path, ENTRIES[:count])
+                self.assertEqual(utils._count_entries(self.path), count)
+
+    def test_empty_array(self):
+        """An empty array has no entries."""
+        self.path.write_text("[]")
+        self.assertEqual(utils._count_entries(self.path), 0)
+
+class TestLoadNewest(DataFileTestCase):
+    """Test loading the newest entries of a data file."""
+
+    def setUp(self):
+        super().setUp()
+        self.entries = [{"id": str(i), "visit_time": f"2025-01-01T00:00:{i:02d}"} for i in range(10)]
+
+    def test_tail_read(self):
+        """With sorted data assumed, limited listings only read the end of the file."""
+        write_entries(self.path, self.entries)
+        with mock.patch.object(utils, "_ASSUME_SORTED", True), mock.patch.object(utils, "_load_cached") as load_cached:
+            newest, total = utils._load_newest(self.path, utils._visit_time_key, 3)
+        load_cached.assert_not_called()
+        self.assertEqual((newest, total), (self.entries[::-1][:3], 10))
+
+    def test_out_of_order_tail(self):
+        """A tail that isn't newest last falls back to loading and sorting the whole file."""
+        self.entries[8], self.entries[9] = self.entries[9], self.entries[8]
+        write_entries(self.path, self.entries)
+        with mock.patch.object(utils, "_ASSUME_SORTED", True):
+            newest, total = utils._load_newest(self.path, utils._visit_time_key, 3)
+        self.assertEqual([entry["id"] for entry in newest], ["9", "8", "7"])
+        self.assertEqual(total, 10)
+
+    def test_other_layouts(self):
+        """Files the tail read can't handle give the same listing through a full parse."""
+        for layout in ("compact", "indent4"):
+            with self.subTest(layout=layout):
+                write_entries(self.path, self.entries, layout)
+                with mock.patch.object(utils, "_ASSUME_SORTED", True):
+                    self.assertEqual(utils._load_newest(self.path, utils._visit_time_key, 3), (self.entries[::-1][:3], 10))
+
+class TestScanEntry(DataFileTestCase):
+    """Test finding an entry by searching the raw file bytes for its id."""
+
+    def test_found(self):
+        """Entries in the services' layout are found by full id and by prefix."""
+        write_entries(self.path, ENTRIES)
+        for entry in ENTRIES:
+            with self.subTest(entry_id=entry["id"]):
+                self.assertEqual(utils._scan_entry(self.path, entry["id"]), (True, entry))
+                self.assertEqual(utils._scan_entry(self.path, entry["id"][:2]), (True, entry))
+
+    def test_nested_id(self):
+        """An "id" key nested inside answers is skipped, even when it appears before the real entry."""
+        write_entries(self.path, ENTRIES)
+        self.assertEqual(utils._scan_entry(self.path, "dddd"), (True, ENTRIES[4]))
+        self.assertEqual(utils._scan_entry(self.path, "eeee"), (True, None))
+
+    def test_id_in_string_value(self):
+        """Text that looks like an id inside a string value is never taken for the entry's id."""
+        write_entries(self.path, ENTRIES)
+        self.assertEqual(utils._scan_entry(self.path, "cccc"), (True, ENTRIES[2]))
+        entries = [{"id": "a1", "purpose": 'see "id": "b2"'}, {"id": "b2"}]
+        write_entries(self.path, entries)
+        self.assertEqual(utils._scan_entry(self.path, "b"), (True, entries[1]))
+
+    def test_missing(self):
+        """A plain id that isn't in the file is resolved as missing without a full parse."""
+        write_entries(self.path, ENTRIES)
+        self.assertEqual(utils._scan_entry(self.path, "zzzz"), (True, None))
+
+    def test_escaped_id(self):
+        """Ids that could be written with escapes are left for a full parse when the bytes don't match."""
+        write_entries(self.path, ENTRIES, "indent4")
+        self.assertEqual(utils._scan_entry(self.path, "éé"), (False, None))
+        write_entries(self.path, ENTRIES)
+        self.assertEqual(utils._scan_entry(self.path, "ü"), (False, None))
+
+    def test_other_layouts(self):
+        """Compact and four-space indented files are left for a full parse."""
+        for layout in ("compact", "indent4"):
+            with self.subTest(layout=layout):
+                write_entries(self.path, ENTRIES, layout)
+                self.assertEqual(utils._scan_entry(self.path, "bbbb"), (False, None))
+
+    def test_empty(self):
+        """Empty files are left for a full parse and empty arrays hold nothing."""
+        self.path.write_bytes(b"")
+        self.assertEqual(utils._scan_entry(self.path, "a"), (False, None))
+        self.path.write_text("[]")
+        self.assertEqual(utils._scan_entry(self.path, "a"), (True, None))
+
+if __name__ == "__main__":
+    unittest.main()
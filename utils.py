@@ -1,10 +1,469 @@
 import json
 import argparse
+import hashlib
+import heapq
+import itertools
+import pickle
+import re
+import tempfile
+import warnings
 from pathlib import Path
-from datetime import datetime
-from tabulate import tabulate
+import ijson
+import mmap
 import os
 import sys
+from operator import methodcaller
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Trust data files that look time ordered instead of sorting them; the services only ever append,
+# so files are normally oldest first, but a hand-edited file could pass the sample check and still be out of order
+_ASSUME_SORTED = os.environ.get("AGENT_API_ASSUME_SORTED") == "1"
+
+# Number of entries sampled from each end of a file to check that it is time ordered
+_SORTED_SAMPLE_SIZE = 64
+
+# NumPy's O(n) partition only beats the O(n log limit) heap for long lists and large limits;
+# below these sizes converting the timestamps costs more than the selection saves
+_NUMPY_MIN_ENTRIES = 2000
+_NUMPY_MIN_LIMIT = 1000
+
+# Number of leading id characters used as the key of the detail index
+_INDEX_KEY_LENGTH = 8
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# In a JSON array written with two space indentation (as the services write their data files), every
+# entry opens with a line holding just "  {"; nested values are indented further and strings can't
+# contain raw newlines, so these lines mark entries without parsing anything
+_ENTRY_START_LINE = b"  {"
+_ENTRY_START = re.compile(rb"^  \{$", re.MULTILINE)
+_ARRAY_LINES = {b"", b"[", b"]", b"[]"}
+
+# Sort keys evaluated in C; ISO timestamps sort chronologically as plain strings,
+# so there's no need to parse them into datetimes first. The services always write naive
+# local timestamps with datetime.isoformat(), so there are no mixed UTC offsets that would
+# need real datetimes (memoized or not) to order correctly
+_visit_time_key = methodcaller("get", "visit_time", "2000-01-01T00:00:00")
+_submission_time_key = methodcaller("get", "submission_time", "2000-01-01T00:00:00")
+
+def _iter_entries(path):
+    """Stream entries from a JSON array file one at a time."""
+    # Large read buffer so ijson is fed in big chunks
+    with open(path, "rb", buffering=1 << 20) as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+def _load_json(path):
+    """Parse a whole JSON file, with orjson straight from a memory map when available."""
+    with open(path, "rb") as f:
+        # Empty files can't be mapped; let the parser report them as invalid
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _loads(view)
+
+def _cache_dir():
+    """Get this user's private directory for parsed data caches, or None if it can't be trusted."""
+    cache_dir = Path(tempfile.gettempdir()) / f"graysky-cli-{os.getuid()}"
+    try:
+        cache_dir.mkdir(mode=0o700, exist_ok=True)
+        st = cache_dir.stat()
+    except OSError:
+        return None
+    # Cache files are unpickled, so only use a directory nobody else can write to
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return None
+    return cache_dir
+
+def _cache_prefix(path):
+    """Get the cache file name prefix shared by every version of a data file."""
+    digest = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:12]
+    return f"{Path(path).name}.{digest}."
+
+def _cache_file(path, cache_dir, st):
+    """Get the cache file for the version of a data file described by its stat result, keyed on its mtime and size."""
+    return cache_dir / f"{_cache_prefix(path)}{st.st_mtime_ns}.{st.st_size}.pkl"
+
+def _read_cache(path, st):
+    """Get the cached entries for a data file, or None if there is no cache for the version described by st."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        return pickle.loads(_cache_file(path, cache_dir, st).read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+def _load_cached(path):
+    """Parse a JSON data file, reusing the entries cached by an earlier run while the file is unchanged."""
+    # Stat before parsing, so a write that lands during the parse leaves the cache keyed on
+    # the old version, where it is never used again, rather than serving old entries as new
+    st = os.stat(path)
+    data = _read_cache(path, st)
+    if data is not None:
+        return data
+    
+    data = _load_json(path)
+    cache_dir = _cache_dir()
+    if cache_dir is not None:
+        cache_file = _cache_file(path, cache_dir, st)
+        # Sweep caches for older versions of the file
+        for stale in cache_dir.glob(_cache_prefix(path) + "*.pkl"):
+            stale.unlink(missing_ok=True)
+        # Write to a temporary name and rename so readers never see a partial cache
+        try:
+            with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as f:
+                f.write(pickle.dumps(data, protocol=5))
+            os.replace(f.name, cache_file)
+        except OSError:
+            pass
+    return data
+
+def _build_index(path):
+    """Map the leading characters of each entry id to the byte ranges of those entries in a JSON array file."""
+    raw = Path(path).read_bytes()
+    text = raw.decode("utf-8")
+    # Character and byte offsets only differ once the file holds non-ASCII text
+    ascii_only = raw.isascii()
+    last_char = last_byte = 0
+    
+    def byte_offset(char_offset):
+        nonlocal last_char, last_byte
+        if ascii_only:
+            return char_offset
+        last_byte += len(text[last_char:char_offset].encode("utf-8"))
+        last_char = char_offset
+        return last_byte
+    
+    decoder = json.JSONDecoder()
+    index = {}
+    pos = _WHITESPACE.match(text).end()
+    if not text.startswith("[", pos):
+        raise json.JSONDecodeError("Expecting '['", text, pos)
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    if text.startswith("]", pos):
+        return index
+    
+    while True:
+        entry, end = decoder.raw_decode(text, pos)
+        entry_id = entry.get("id", "") if isinstance(entry, dict) else None
+        if isinstance(entry_id, str):
+            index.setdefault(entry_id[:_INDEX_KEY_LENGTH], []).append((byte_offset(pos), byte_offset(end)))
+        
+        pos = _WHITESPACE.match(text, end).end()
+        if text.startswith(",", pos):
+            pos = _WHITESPACE.match(text, pos + 1).end()
+        elif text.startswith("]", pos):
+            return index
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+
+def _load_index(path):
+    """Get the detail index for the current version of a data file, building it if needed."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    
+    index_file = _cache_file(path, cache_dir, os.stat(path)).with_suffix(".idx")
+    try:
+        return pickle.loads(index_file.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    
+    index = _build_index(path)
+    # Sweep indexes for older versions of the file
+    for stale in cache_dir.glob(_cache_prefix(path) + "*.idx"):
+        stale.unlink(missing_ok=True)
+    try:
+        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as f:
+            f.write(pickle.dumps(index, protocol=5))
+        os.replace(f.name, index_file)
+    except OSError:
+        pass
+    return index
+
+def _scan_entry(path, entry_id):
+    """
+    Look for the first entry whose id starts with entry_id by searching the raw file bytes.
+    
+    Only the entry around each candidate match is parsed. Returns a (resolved, entry) pair;
+    resolved is False when the file isn't laid out the way the services write it and the
+    caller has to fall back to parsing.
+    """
+    # Ids written with escapes would not match a plain byte search, so a miss is only conclusive for plain ids
+    plain_id = entry_id.isascii() and entry_id.isprintable() and '"' not in entry_id and "\\" not in entry_id
+    pattern = re.compile(rb'"id"\s*:\s*"' + re.escape(entry_id.encode("utf-8")))
+    entry_start = b"\n" + _ENTRY_START_LINE + b"\n"
+    entry_end = b"\n" + _ENTRY_START_LINE.replace(b"{", b"}")
+    
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return False, None
+        with mm:
+            for match in pattern.finditer(mm):
+                # Entries are written indented by two spaces, so lines holding only their opening and
+                # closing braces delimit the entry; nested objects and string values never produce them
+                start = mm.rfind(entry_start, 0, match.start())
+                end = mm.find(entry_end, match.end())
+                if start < 0 or end < 0:
+                    return False, None
+                try:
+                    entry = _loads(mm[start + 1:end + len(entry_end)])
+                except ValueError:
+                    return False, None
+                # The match may be a nested "id" key or text inside a string value
+                entry_id_value = entry.get("id") if isinstance(entry, dict) else None
+                if isinstance(entry_id_value, str) and entry_id_value.startswith(entry_id):
+                    return True, entry
+    return plain_id, None
+
+def _find_entry(path, entry_id):
+    """Find the first entry whose id starts with entry_id."""
+    # A byte search usually settles the lookup without parsing the file or building its index
+    resolved, entry = _scan_entry(path, entry_id)
+    if resolved:
+        return entry
+    
+    index = _load_index(path)
+    if index is None:
+        # No index to keep, so stream the file and stop as soon as the entry is found
+        return next((item for item in _iter_entries(path) if item.get("id", "").startswith(entry_id)), None)
+    
+    if len(entry_id) >= _INDEX_KEY_LENGTH:
+        ranges = index.get(entry_id[:_INDEX_KEY_LENGTH], [])
+    else:
+        # Shorter prefixes can match several keys. Keys were added in file order, so keeping the
+        # first entry of the first key for each prefix gives the first match in the file
+        prefix_length = len(entry_id)
+        by_prefix = {}
+        for key, key_ranges in index.items():
+            by_prefix.setdefault(key[:prefix_length], key_ranges[0])
+        ranges = [by_prefix[entry_id]] if entry_id in by_prefix else []
+    if not ranges:
+        return None
+    
+    # Parse only the candidate entries, straight out of a memory map of the file
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start, end in ranges:
+            entry = _loads(mm[start:end])
+            if entry.get("id", "").startswith(entry_id):
+                return entry
+    return None
+
+def _newest_numpy(data, key, limit):
+    """Select the newest limit entries with a NumPy partition, or None if NumPy can't be used."""
+    # Imported here since it's optional and slow to import, and only large listings need it
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    
+    try:
+        # NumPy only warns about timezone offsets and converts them to UTC, which wouldn't
+        # match the plain string ordering used everywhere else
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            ticks = np.array([key(entry) for entry in data], dtype="datetime64[us]").view("i8")
+    except (TypeError, ValueError, Warning):
+        return None
+    
+    # Everything newer than the limit-th newest timestamp, plus as many entries sharing
+    # that timestamp as still fit, taken in file order like heapq.nlargest does
+    kth = np.partition(ticks, len(ticks) - limit)[len(ticks) - limit]
+    newer = np.flatnonzero(ticks > kth)
+    ties = np.flatnonzero(ticks == kth)[:limit - len(newer)]
+    idx = np.sort(np.concatenate((newer, ties)))
+    idx = idx[np.argsort(-ticks[idx], kind="stable")]
+    return [data[i] for i in idx]
+
+def _presorted(data, key, limit=None):
+    """Take the newest entries straight from a list already in time order, or None if it doesn't look ordered."""
+    # Short lists are checked whole, so the two ends never overlap and repeat entries in the sample
+    if len(data) <= 2 * _SORTED_SAMPLE_SIZE:
+        sample = [key(entry) for entry in data]
+    else:
+        sample = [key(entry) for entry in data[:_SORTED_SAMPLE_SIZE] + data[-_SORTED_SAMPLE_SIZE:]]
+    pairs = list(zip(sample, sample[1:]))
+    if all(a <= b for a, b in pairs):
+        # Oldest first, as the services append entries
+        return data[-limit:][::-1] if limit else data[::-1]
+    if all(a >= b for a, b in pairs):
+        return data[:limit] if limit else data
+    return None
+
+def _tail_entries(path, limit, chunk_size=64 * 1024):
+    """
+    Read the last limit entries of an indented JSON array file, last entry first, without touching the rest.
+    
+    Returns None if the file isn't laid out with one "  {" ... "  }" block per entry.
+    """
+    entries = []
+    entry_lines = None  # Lines of the entry being read, collected backwards
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while len(entries) < limit:
+            if pos == 0:
+                # Start of the file reached; the leftover is the first line
+                lines, partial = [partial], None
+            else:
+                read = min(chunk_size, pos)
+                pos -= read
+                f.seek(pos)
+                # The first line may continue in the previous chunk, so hold it back
+                partial, *lines = (f.read(read) + partial).split(b"\n")
+            
+            for line in reversed(lines):
+                if entry_lines is None:
+                    if line.startswith(b"  }"):
+                        entry_lines = [line.rstrip(b",")]
+                    elif line.rstrip() not in _ARRAY_LINES:
+                        return None
+                    elif line.startswith(b"["):
+                        return entries
+                elif line == _ENTRY_START_LINE:
+                    entry_lines.append(line)
+                    try:
+                        entries.append(_loads(b"\n".join(reversed(entry_lines))))
+                    except ValueError:
+                        return None
+                    entry_lines = None
+                    if len(entries) == limit:
+                        return entries
+                else:
+                    entry_lines.append(line)
+            
+            if partial is None:
+                return None
+    return entries
+
+def _count_entries(path):
+    """Count the entries of an indented JSON array file without parsing them."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return sum(1 for _ in _ENTRY_START.finditer(mm))
+
+def _load_newest(path, key, limit=None):
+    """Load the newest entries of a data file first, up to limit if given, along with the total number of entries."""
+    # Time ordered files only need their last entries read, as the services append new ones at the end
+    if _ASSUME_SORTED and limit:
+        tail = _tail_entries(path, limit)
+        if tail is not None:
+            keys = [key(entry) for entry in tail]
+            if all(a >= b for a, b in zip(keys, keys[1:])):
+                return tail, _count_entries(path)
+    
+    return _newest(_load_cached(path), key, limit)
+
+def _newest(entries, key, limit=None):
+    """Return the newest entries first, up to limit if given, along with the total number of entries."""
+    if _ASSUME_SORTED and isinstance(entries, list):
+        newest = _presorted(entries, key, limit)
+        if newest is not None:
+            return newest, len(entries)
+    
+    if not limit:
+        data = sorted(entries, key=key, reverse=True)
+        return data, len(data)
+    
+    # Large selections from long lists are partitioned in O(n) by NumPy instead of going through the heap
+    if isinstance(entries, list) and _NUMPY_MIN_LIMIT <= limit < len(entries) and len(entries) > _NUMPY_MIN_ENTRIES:
+        newest = _newest_numpy(entries, key, limit)
+        if newest is not None:
+            return newest, len(entries)
+    
+    # Keep only a heap of limit entries while streaming, counting the entries as they pass;
+    # zip stops pulling from the counter once the entries run out, so it ends at the total
+    seen = itertools.count()
+    newest = heapq.nlargest(limit, (entry for entry, _ in zip(entries, seen)), key=key)
+    return newest, next(seen)
+
+def _trunc(text, length=30):
+    """Truncate long text for display, marking the cut with an ellipsis."""
+    return text[:length] + "..." if text and len(text) > length else text
+
+def _dumps_indented(value):
+    """Serialize a value as JSON indented by two spaces, for display."""
+    if orjson is None:
+        return json.dumps(value, indent=2)
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+
+def _cell_lines(value):
+    """Split a table cell into its display lines."""
+    return ("" if value is None else str(value)).strip().split("\n")
+
+def _render_table(rows, headers):
+    """Write rows to stdout as a table in the layout of tabulate's "pretty" format."""
+    # Column widths need every row before anything can be written, so render the rows to their
+    # cell lines once here; rows may be any iterable, such as a generator
+    cells = [[_cell_lines(value) for value in row] for row in rows]
+    
+    # One pass over every column to find its width
+    widths = [
+        max(len(line) for cell in column for line in cell)
+        for column in zip([[header] for header in headers], *cells)
+    ]
+    separator = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+    fmt = "| " + " | ".join(f"{{:^{width}}}" for width in widths) + " |\n"
+    
+    out = [separator, fmt.format(*headers), separator]
+    for row in cells:
+        height = max(len(cell) for cell in row)
+        if height == 1:
+            out.append(fmt.format(*(cell[0] for cell in row)))
+        else:
+            # Multi-line cells are top aligned, padding shorter cells with blank lines
+            for i in range(height):
+                out.append(fmt.format(*(cell[i] if i < len(cell) else "" for cell in row)))
+    out.append(separator)
+    sys.stdout.writelines(out)
+
+def _build_welcome_rows(entries, show_answers=False):
+    """Lazily build the welcome book listing rows; the table renderer only keeps their rendered cells."""
+    if show_answers:
+        return (
+            [
+                entry.get("id", "N/A")[:8] + "...",
+                entry.get("name", "N/A"),
+                entry.get("agent_type", "N/A"),
+                entry.get("visit_time", "N/A"),
+                entry.get("visit_count", 1),
+                entry.get("purpose", "N/A"),
+                _dumps_indented(entry.get("answers", {}))
+            ]
+            for entry in entries
+        )
+    return (
+        [
+            entry.get("id", "N/A")[:8] + "...",
+            entry.get("name", "N/A"),
+            entry.get("agent_type", "N/A"),
+            entry.get("visit_time", "N/A"),
+            entry.get("visit_count", 1),
+            entry.get("purpose", "N/A")
+        ]
+        for entry in entries
+    )
+
+def _build_feedback_rows(entries):
+    """Build the feedback listing rows, pulling every column out in a single pass over the entries and zipping them."""
+    ids, agent_names, agent_types, submission_times, ratings, issues, feature_requests = [], [], [], [], [], [], []
+    for entry in entries:
+        ids.append(entry.get("id", "N/A")[:8] + "...")
+        agent_names.append(entry.get("agent_name", "N/A"))
+        agent_types.append(entry.get("agent_type", "N/A"))
+        submission_times.append(entry.get("submission_time", "N/A"))
+        ratings.append(entry.get("usability_rating", "N/A"))
+        issues.append(_trunc(entry.get("issues", "N/A")))
+        feature_requests.append(_trunc(entry.get("feature_requests", "N/A")))
+    return zip(ids, agent_names, agent_types, submission_times, ratings, issues, feature_requests)
 
 def display_welcome_book(limit=None, show_answers=False):
     """Display welcome book entries."""
@@ -14,9 +473,9 @@ def display_welcome_book(limit=None, show_answers=False):
         print("No welcome book entries found.")
         return
     
+    # Sort by visit time (newest first) and apply limit if specified
     try:
-        with open(welcome_book_path, "r") as f:
-            data = json.load(f)
+        sorted_data, total = _load_newest(welcome_book_path, _visit_time_key, limit)
     except json.JSONDecodeError:
         print("Error: Welcome book file is corrupted.")
         return
@@ -24,51 +483,18 @@ def display_welcome_book(limit=None, show_answers=False):
         print(f"Error: Failed to read welcome book: {str(e)}")
         return
     
-    if not data:
+    if not total:
         print("No welcome book entries found.")
         return
     
-    # Sort by visit time (newest first)
-    sorted_data = sorted(
-        data, 
-        key=lambda x: datetime.fromisoformat(x.get("visit_time", "2000-01-01T00:00:00")), 
-        reverse=True
-    )
-    
-    # Apply limit if specified
-    if limit:
-        sorted_data = sorted_data[:limit]
-    
     if show_answers:
         headers = ["ID", "Name", "Agent Type", "Visit Time", "Visit Count", "Purpose", "Answers"]
-        rows = [
-            [
-                entry.get("id", "N/A")[:8] + "...",
-                entry.get("name", "N/A"),
-                entry.get("agent_type", "N/A"),
-                entry.get("visit_time", "N/A"),
-                entry.get("visit_count", 1),
-                entry.get("purpose", "N/A"),
-                json.dumps(entry.get("answers", {}), indent=2)
-            ]
-            for entry in sorted_data
-        ]
     else:
         headers = ["ID", "Name", "Agent Type", "Visit Time", "Visit Count", "Purpose"]
-        rows = [
-            [
-                entry.get("id", "N/A")[:8] + "...",
-                entry.get("name", "N/A"),
-                entry.get("agent_type", "N/A"),
-                entry.get("visit_time", "N/A"),
-                entry.get("visit_count", 1),
-                entry.get("purpose", "N/A")
-            ]
-            for entry in sorted_data
-        ]
+    rows = _build_welcome_rows(sorted_data, show_answers)
     
-    print(tabulate(rows, headers=headers, tablefmt="pretty"))
-    print(f"Total entries: {len(data)}")
+    _render_table(rows, headers)
+    print(f"Total entries: {total}")
 
 def display_feedback(limit=None):
     """Display feedback entries."""
@@ -78,9 +504,9 @@ def display_feedback(limit=None):
         print("No feedback entries found.")
         return
     
+    # Sort by submission time (newest first) and apply limit if specified
     try:
-        with open(feedback_path, "r") as f:
-            data = json.load(f)
+        sorted_data, total = _load_newest(feedback_path, _submission_time_key, limit)
     except json.JSONDecodeError:
         print("Error: Feedback file is corrupted.")
         return
@@ -88,37 +514,15 @@ def display_feedback(limit=None):
         print(f"Error: Failed to read feedback: {str(e)}")
         return
     
-    if not data:
+    if not total:
         print("No feedback entries found.")
         return
     
-    # Sort by submission time (newest first)
-    sorted_data = sorted(
-        data, 
-        key=lambda x: datetime.fromisoformat(x.get("submission_time", "2000-01-01T00:00:00")), 
-        reverse=True
-    )
-    
-    # Apply limit if specified
-    if limit:
-        sorted_data = sorted_data[:limit]
-    
     headers = ["ID", "Agent Name", "Agent Type", "Submission Time", "Rating", "Issues", "Feature Requests"]
-    rows = [
-        [
-            entry.get("id", "N/A")[:8] + "...",
-            entry.get("agent_name", "N/A"),
-            entry.get("agent_type", "N/A"),
-            entry.get("submission_time", "N/A"),
-            entry.get("usability_rating", "N/A"),
-            (entry.get("issues", "N/A")[:30] + "...") if entry.get("issues") and len(entry.get("issues")) > 30 else entry.get("issues", "N/A"),
-            (entry.get("feature_requests", "N/A")[:30] + "...") if entry.get("feature_requests") and len(entry.get("feature_requests")) > 30 else entry.get("feature_requests", "N/A")
-        ]
-        for entry in sorted_data
-    ]
+    rows = _build_feedback_rows(sorted_data)
     
-    print(tabulate(rows, headers=headers, tablefmt="pretty"))
-    print(f"Total entries: {len(data)}")
+    _render_table(rows, headers)
+    print(f"Total entries: {total}")
 
 def display_entry_detail(entry_id, data_type="welcome_book"):
     """Display detailed information for a specific entry."""
@@ -136,42 +540,42 @@ def display_entry_detail(entry_id, data_type="welcome_book"):
         print(f"No {data_type} entries found.")
         return
     
+    # Find entry with matching ID
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        entry = _find_entry(file_path, entry_id)
+    except (ijson.JSONError, json.JSONDecodeError):
         print(f"Error: {data_type} file is corrupted.")
         return
     except Exception as e:
         print(f"Error: Failed to read {data_type}: {str(e)}")
         return
     
-    # Find entry with matching ID
-    entry = next((item for item in data if item.get("id", "").startswith(entry_id)), None)
-    
     if not entry:
         print(f"No {data_type} entry found with ID: {entry_id}")
         return
     
-    print(f"\n{title} Details:")
-    print("=" * 50)
+    # Build the whole report and write it in one call
+    out = [f"\n{title} Details:\n", "=" * 50 + "\n"]
     
     # Format entry data
     for key, value in entry.items():
         if key in ["answers", "feature_requests", "issues", "additional_comments"]:
-            print(f"\n{key.capitalize()}:")
-            print("-" * 50)
+            out.append(f"\n{key.capitalize()}:\n")
+            out.append("-" * 50 + "\n")
             if isinstance(value, dict):
                 for k, v in value.items():
-                    print(f"{k}: {v}")
+                    out.append(f"{k}: {v}\n")
             else:
-                print(value)
+                out.append(f"{value}\n")
         else:
-            print(f"{key}: {value}")
+            out.append(f"{key}: {value}\n")
     
-    print("=" * 50)
+    out.append("=" * 50 + "\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
-def main():
+def _build_parser():
+    """Build the command line parser."""
     parser = argparse.ArgumentParser(description='Graysky Agent API Data Review Utility')
     
     # Create subparsers for different commands
@@ -188,22 +592,40 @@ def main():
     feedback_parser.add_argument('-l', '--limit', type=int, help='Limit number of entries to display')
     feedback_parser.add_argument('-d', '--detail', type=str, help='Show detailed information for specific entry ID')
     
+    return parser
+
+# Built once at import so main() only parses and dispatches
+_PARSER = _build_parser()
+
+def _cmd_welcome(args):
+    """Run the welcome command."""
+    if args.detail:
+        display_entry_detail(args.detail, "welcome_book")
+    else:
+        display_welcome_book(args.limit, args.answers)
+
+def _cmd_feedback(args):
+    """Run the feedback command."""
+    if args.detail:
+        display_entry_detail(args.detail, "feedback")
+    else:
+        display_feedback(args.limit)
+
+_COMMANDS = {
+    'welcome': _cmd_welcome,
+    'feedback': _cmd_feedback,
+}
+
+def main():
     # Parse arguments
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     # Execute command
-    if args.command == 'welcome':
-        if args.detail:
-            display_entry_detail(args.detail, "welcome_book")
-        else:
-            display_welcome_book(args.limit, args.answers)
-    elif args.command == 'feedback':
-        if args.detail:
-            display_entry_detail(args.detail, "feedback")
-        else:
-            display_feedback(args.limit)
+    command = _COMMANDS.get(args.command)
+    if command:
+        command(args)
     else:
-        parser.print_help()
+        _PARSER.print_help()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file